@@ -11,15 +11,18 @@ const {
   isBotAlliedName,
   isBotAllyPlayer,
   hasDefaultSkin,
-  isPointInsideAnyWall,
   lineIntersectsAnyWall,
-  segmentCrossesWallDiscrete,
+  segmentHitsAnyWall,
   distanceToLineSq,
+  distanceToSegmentSq,
   circleCollidesAnyWall,
   worldToGrid,
   gridToWorld,
   cellKey,
   isCellWithinBounds,
+  buildWallIndex,
+  circleCollidesIndexedWalls,
+  segmentHitsIndexedWalls,
 } = require("./helpers");
 
 const colors = [
@@ -45,12 +48,118 @@ const WEAPON_DAMAGE = {
 
 const DEFAULT_BULLET_RADIUS = 5;
 const DEFAULT_BULLET_SPEED = 10;
+const DEFAULT_WEAPON_LENGTH = 30;
+const DEFAULT_WEAPON_COOLDOWN_MS = 100;
 const BULLET_MAX_LIFETIME_MS = 4000;
 
+const VALID_WEAPON_KEYS = new Set(Object.keys(WEAPON_DAMAGE));
+
+// Per-weapon stats with the defaults already applied, so tracking a shot or
+// firing a bot's weapon is a single lookup instead of a chain of typeof checks.
+const WEAPON_STATS = {};
+for (const key of Object.keys(WEAPONS)) {
+  const cfg = WEAPONS[key];
+  WEAPON_STATS[key] = {
+    speed:
+      typeof cfg.bulletSpeed === "number" ? cfg.bulletSpeed : DEFAULT_BULLET_SPEED,
+    radius:
+      typeof cfg.bulletRadius === "number" ? cfg.bulletRadius : DEFAULT_BULLET_RADIUS,
+    weaponLength:
+      typeof cfg.weaponLength === "number" ? cfg.weaponLength : DEFAULT_WEAPON_LENGTH,
+    cooldownMs:
+      typeof cfg.cooldownMs === "number" ? cfg.cooldownMs : DEFAULT_WEAPON_COOLDOWN_MS,
+  };
+}
+
+// 8-connected A* neighbour offsets and step costs, shared by every search.
+const PATH_DIRECTIONS = [
+  { dc: 1, dr: 0, cost: 1 },
+  { dc: -1, dr: 0, cost: 1 },
+  { dc: 0, dr: 1, cost: 1 },
+  { dc: 0, dr: -1, cost: 1 },
+  { dc: 1, dr: 1, cost: Math.SQRT2 },
+  { dc: -1, dr: 1, cost: Math.SQRT2 },
+  { dc: 1, dr: -1, cost: Math.SQRT2 },
+  { dc: -1, dr: -1, cost: Math.SQRT2 },
+];
+
+// Every bot state field, declared up front. Bots pick these up lazily and in
+// different orders, which otherwise leaves each bot's state with its own
+// hidden class and makes the controller's property accesses megamorphic.
+// null reads the same as "unset" to all the typeof/truthiness checks.
+function createBotState() {
+  return {
+    lastShotAt: 0,
+    lastHealth: null,
+    lastDamageTakenAt: null,
+    lastDamageDealtAt: null,
+    lastMoveMode: null,
+    targetMemory: null,
+    losCache: null,
+    // Strafing
+    strafeDir: null,
+    lastStrafeDirUsed: null,
+    lastStrafeDriftCheck: null,
+    lastStrafeFlipAt: null,
+    damageStrafeChain: null,
+    lastDamageStrafeDir: null,
+    lastDamageStrafeTime: null,
+    strafeChargeUntil: null,
+    strafeChargeDirX: null,
+    strafeChargeDirY: null,
+    // Dodging, peeking and pausing
+    dodgeUntil: null,
+    dodgeDirX: null,
+    dodgeDirY: null,
+    lastDodgedBulletId: null,
+    pushThroughUntil: null,
+    pushThroughForTargetId: null,
+    peekThreatCount: null,
+    lastPeekThreatAt: null,
+    peekMode: null,
+    peekModeUntil: null,
+    peekModeTargetId: null,
+    peekFallbackX: null,
+    peekFallbackY: null,
+    pauseUntil: null,
+    lastPauseDecisionAt: null,
+    // Navigation
+    navPath: null,
+    navPathIndex: null,
+    navPathCost: null,
+    navPathLockUntil: null,
+    navPathNeedsRecalc: null,
+    navForcePath: null,
+    navFailCount: null,
+    navLastFailAt: null,
+    navLastCalcAt: null,
+    navLastCalcX: null,
+    navLastCalcY: null,
+    navLastGoalX: null,
+    navLastGoalY: null,
+    navLastAcceptedAt: null,
+    navLastBlockedAt: null,
+    navLingerStart: null,
+    navLingerAnchorX: null,
+    navLingerAnchorY: null,
+    navProgressTargetIdx: null,
+    navProgressCheckAt: null,
+    navProgressLastDist: null,
+    navProgressLastX: null,
+    navProgressLastY: null,
+    navStuckSampleTime: null,
+    navStuckSampleX: null,
+    navStuckSampleY: null,
+  };
+}
+
 function createGameServer(io) {
   // Game state
   const waitingPlayers = [];
   const activePlayers = [];
+  // id -> player index over activePlayers, for O(1) lookups in the
+  // per-message socket handlers. Kept in sync wherever activePlayers changes.
+  const activePlayersById = new Map();
   const gameInProgress = { status: false };
   const gameWalls = [];
   // Simple server-side bot config (step 0: scripted bots)
@@ -66,6 +175,11 @@ function createGameServer(io) {
     canvasHeight: 600,
     aimInaccuracy: 0.0,
   };
+  // The bot weapon is fixed, so look its stats up once.
+  const BOT_WEAPON = WEAPON_STATS[BOT_CONFIG.weaponKey];
+  if (!BOT_WEAPON) {
+    throw new Error(`Unknown bot weapon: ${BOT_CONFIG.weaponKey}`);
+  }
   let nextBotId = 1;
 
   // Bullet bookkeeping so each bullet only ever applies damage once.
@@ -160,7 +274,7 @@ function createGameServer(io) {
     while (waitingPlayers.length > 0) {
       const player = waitingPlayers.pop();
       const spawnPosition = getValidSpawnPosition(walls, activePlayers);
-      activePlayers.push({
+      addActivePlayer({
         ...player,
         x: spawnPosition.x,
         y: spawnPosition.y,
@@ -184,29 +298,72 @@ function createGameServer(io) {
     );
   }
 
+  // Every gameState broadcast goes through here: bot ticks, player updates and
+  // the shop's skin-equip route. Reuse a fixed set of snapshot objects and
+  // leave server-only fields (botState with its nav path and LOS cache) off
+  // the wire.
+  const gameStateSnapshot = [];
+
+  function emitGameState() {
+    gameStateSnapshot.length = activePlayers.length;
+    for (let i = 0; i < activePlayers.length; i++) {
+      const p = activePlayers[i];
+      let snap = gameStateSnapshot[i];
+      if (!snap) {
+        snap = {
+          id: null,
+          name: null,
+          displayName: null,
+          accountUsername: null,
+          color: null,
+          weapon: null,
+          weaponSkinKey: null,
+          x: 0,
+          y: 0,
+          angle: 0,
+          alive: false,
+          health: 0,
+          isBot: false,
+        };
+        gameStateSnapshot[i] = snap;
+      }
+      snap.id = p.id;
+      snap.name = p.name;
+      snap.displayName = p.displayName;
+      snap.accountUsername = p.accountUsername;
+      snap.color = p.color;
+      snap.weapon = p.weapon;
+      snap.weaponSkinKey = p.weaponSkinKey;
+      snap.x = p.x;
+      snap.y = p.y;
+      snap.angle = p.angle;
+      snap.alive = p.alive;
+      snap.health = p.health;
+      snap.isBot = !!p.isBot;
+    }
+    io.emit("gameState", gameStateSnapshot);
+  }
+
   function handlePlayerUpdate(socket, data) {
-    const player = activePlayers.find((p) => p.id === socket.id);
+    const player = activePlayersById.get(socket.id);
     if (player && player.alive) {
       player.x = data.x;
       player.y = data.y;
       player.angle = data.angle;
 
-      io.emit("gameState", activePlayers);
+      emitGameState();
     }
   }
 
   function handleShoot(socket, bulletData) {
-    const player = activePlayers.find((p) => p.id === socket.id);
+    const player = activePlayersById.get(socket.id);
     if (!player || !player.alive) return;
 
     const bx = bulletData && typeof bulletData.x === "number" ? bulletData.x : null;
     const by = bulletData && typeof bulletData.y === "number" ? bulletData.y : null;
     if (bx == null || by == null) return;
 
-    const spawnBlocked =
-      isPointInsideAnyWall(bx, by, gameWalls) ||
-      segmentCrossesWallDiscrete(player.x, player.y, bx, by, gameWalls, 2) ||
-      lineIntersectsAnyWall(player.x, player.y, bx, by, gameWalls);
+    const spawnBlocked = segmentHitsAnyWall(player.x, player.y, bx, by, gameWalls);
     if (spawnBlocked) return;
 
     const bullet = {
@@ -225,10 +382,10 @@ function createGameServer(io) {
     const bulletId =
       payload && typeof payload.bulletId === "number" ? payload.bulletId : null;
 
-    const target = activePlayers.find((p) => p.id === targetId);
+    const target = activePlayersById.get(targetId);
     if (!target || !target.alive) return;
 
-    const shooter = shooterId ? activePlayers.find((p) => p.id === shooterId) : null;
+    const shooter = shooterId ? activePlayersById.get(shooterId) || null : null;
 
     if (shooter && shooter.isBot && isBotAllyPlayer(target)) {
       return;
@@ -247,7 +404,7 @@ function createGameServer(io) {
       const shooterState =
         shooter.botState && typeof shooter.botState === "object"
           ? shooter.botState
-          : (shooter.botState = {});
+          : (shooter.botState = createBotState());
       shooterState.lastDamageDealtAt = now;
     }
 
@@ -255,7 +412,7 @@ function createGameServer(io) {
       const targetState =
         target.botState && typeof target.botState === "object"
           ? target.botState
-          : (target.botState = {});
+          : (target.botState = createBotState());
       targetState.lastDamageTakenAt = now;
     }
 
@@ -301,7 +458,7 @@ function createGameServer(io) {
       }
     }
 
-    io.emit("gameState", activePlayers);
+    emitGameState();
     maybeTriggerGameOver();
   }
 
@@ -315,6 +472,7 @@ function createGameServer(io) {
     const activeIndex = activePlayers.findIndex((p) => p.id === socket.id);
     if (activeIndex !== -1) {
       activePlayers.splice(activeIndex, 1);
+      activePlayersById.delete(socket.id);
       io.emit("playerLeft", socket.id);
       maybeTriggerGameOver();
     }
@@ -322,6 +480,11 @@ function createGameServer(io) {
     console.log("Disconnected:", socket.id);
   }
 
+  function addActivePlayer(player) {
+    activePlayers.push(player);
+    activePlayersById.set(player.id, player);
+  }
+
   function parseJoinPayload(payload, fallbackName) {
     let displayName = "";
     let weapon = "pistol";
@@ -332,8 +495,7 @@ function createGameServer(io) {
       displayName = String(payload.displayName || payload.name || "");
       if (typeof payload.weapon === "string") {
         const key = payload.weapon;
-        const allowed = new Set([...Object.keys(WEAPON_DAMAGE)]);
-        weapon = allowed.has(key) ? key : "pistol";
+        weapon = VALID_WEAPON_KEYS.has(key) ? key : "pistol";
       }
     }
 
@@ -395,6 +557,7 @@ function createGameServer(io) {
       gameOverTimeout = null;
     }
     activePlayers.length = 0;
+    activePlayersById.clear();
     gameWalls.length = 0;
     gameInProgress.status = false;
     nextBotId = 1;
@@ -420,23 +583,29 @@ function createGameServer(io) {
         const closestY = Math.max(wall.y, Math.min(py, wall.y + wall.height));
         const dx = px - closestX;
         const dy = py - closestY;
-        if (Math.sqrt(dx * dx + dy * dy) < PLAYER_RADIUS) return true;
+        if (dx * dx + dy * dy < PLAYER_RADIUS * PLAYER_RADIUS) return true;
       }
       return false;
     }
 
+    // Candidates are drawn from the nav grid's precomputed wall-free cells
+    // (same radius and bounds as above), so they never need a wall test.
+    // `walls` is always the current match layout, which the nav grid caches.
+    const nav = getNavGrid(walls);
+    const freeCells = nav.freeCells;
+    function sampleFreePosition() {
+      const idx = freeCells[Math.floor(Math.random() * freeCells.length)];
+      return gridToWorld(idx % nav.cols, Math.floor(idx / nav.cols), nav);
+    }
+
     // Evaluate candidate with respect to existing players
     function candidateIsValid(cx, cy) {
-      // Not inside or overlapping walls
-      if (overlapsAnyWall(cx, cy)) return false;
-
       for (const p of existingPlayers) {
         if (!p || !p.alive) continue;
         // Keep a minimum spacing
         const dx = cx - p.x;
         const dy = cy - p.y;
-        const dist = Math.sqrt(dx * dx + dy * dy);
-        if (dist < MIN_SPAWN_DISTANCE) return false;
+        if (dx * dx + dy * dy < MIN_SPAWN_DISTANCE * MIN_SPAWN_DISTANCE) return false;
         // Require at least one wall blocking direct LOS
         const blocked = lineIntersectsAnyWall(cx, cy, p.x, p.y, walls);
         if (!blocked) return false;
@@ -448,9 +617,9 @@ function createGameServer(io) {
     let best = null;
     let bestScore = -Infinity;
 
-    for (let attempt = 0; attempt < MAX_ATTEMPTS; attempt++) {
-      const x = Math.random() * (CANVAS_WIDTH - 2 * PLAYER_RADIUS) + PLAYER_RADIUS;
-      const y = Math.random() * (CANVAS_HEIGHT - 2 * PLAYER_RADIUS) + PLAYER_RADIUS;
+    const attempts = freeCells.length > 0 ? MAX_ATTEMPTS : 0;
+    for (let attempt = 0; attempt < attempts; attempt++) {
+      const { x, y } = sampleFreePosition();
 
       if (candidateIsValid(x, y)) {
         return { x, y };
@@ -458,17 +627,19 @@ function createGameServer(io) {
 
       // Fallback scoring: maximize number of blocked LOS, then maximize min distance
       let blockedCount = 0;
-      let minDist = Infinity;
+      let minDistSq = Infinity;
       for (const p of existingPlayers) {
         if (!p || !p.alive) continue;
         const dx = x - p.x;
         const dy = y - p.y;
-        const dist = Math.sqrt(dx * dx + dy * dy);
-        if (dist < minDist) minDist = dist;
+        const distSq = dx * dx + dy * dy;
+        if (distSq < minDistSq) minDistSq = distSq;
         if (lineIntersectsAnyWall(x, y, p.x, p.y, walls)) blockedCount++;
       }
-      const score = blockedCount * 10000 + (isFinite(minDist) ? minDist : 0);
-      if (score > bestScore && !overlapsAnyWall(x, y)) {
+      // Only the winning minimum needs a real distance for the score.
+      const score =
+        blockedCount * 10000 + (isFinite(minDistSq) ? Math.sqrt(minDistSq) : 0);
+      if (score > bestScore) {
         bestScore = score;
         best = { x, y };
       }
@@ -546,10 +717,13 @@ function createGameServer(io) {
     const height = BOT_CONFIG.canvasHeight;
     const cols = Math.ceil(width / cellSize);
     const rows = Math.ceil(height / cellSize);
-    const walkable = new Array(rows);
+    const wallIndex = buildWallIndex(walls, width, height);
+    // Flat row * cols + col occupancy grid: 1 = walkable.
+    const walkable = new Uint8Array(rows * cols);
+    // Flat row * cols + col indices of walkable cells, for spawn sampling.
+    const freeCells = [];
 
     for (let r = 0; r < rows; r++) {
-      walkable[r] = new Array(cols);
       for (let c = 0; c < cols; c++) {
         const wx = c * cellSize + cellSize / 2;
         const wy = r * cellSize + cellSize / 2;
@@ -560,8 +734,11 @@ function createGameServer(io) {
           wy <= height - radius;
         const blocked =
           !insideBounds ||
-          circleCollidesAnyWall(wx, wy, radius, walls);
-        walkable[r][c] = !blocked;
+          circleCollidesIndexedWalls(wx, wy, radius, wallIndex);
+        if (!blocked) {
+          walkable[r * cols + c] = 1;
+          freeCells.push(r * cols + c);
+        }
       }
     }
 
@@ -570,22 +747,26 @@ function createGameServer(io) {
       cols,
       rows,
       walkable,
+      freeCells,
       radius,
       width,
       height,
       walls,
+      wallIndex,
       version: wallLayoutVersion,
     };
   }
 
   function collidesWithBulletsForPath(x, y, radius, bullets) {
     if (!bullets || bullets.length === 0) return false;
-    for (const b of bullets) {
+    const reach = BOT_CONFIG.playerRadius + radius;
+    const reachSq = reach * reach;
+    for (let i = 0; i < bullets.length; i++) {
+      const b = bullets[i];
       if (!b || typeof b.x !== "number" || typeof b.y !== "number") continue;
-      const avoidRadius = BOT_CONFIG.playerRadius;
       const dx = x - b.x;
       const dy = y - b.y;
-      if (dx * dx + dy * dy < (avoidRadius + radius) * (avoidRadius + radius)) {
+      if (dx * dx + dy * dy < reachSq) {
         return true;
       }
     }
@@ -594,9 +775,14 @@ function createGameServer(io) {
 
   function isCellClear(nav, col, row, bullets) {
     if (!isCellWithinBounds(nav, col, row)) return false;
-    if (!nav.walkable[row] || !nav.walkable[row][col]) return false;
-    const pos = gridToWorld(col, row, nav);
-    return !collidesWithBulletsForPath(pos.x, pos.y, nav.radius, bullets);
+    if (nav.walkable[row * nav.cols + col] === 0) return false;
+    if (!bullets || bullets.length === 0) return true;
+    // Cell centre computed inline (same as gridToWorld) to avoid allocating
+    // a point for every neighbour A* expands.
+    const half = nav.cellSize / 2;
+    const cx = col * nav.cellSize + half;
+    const cy = row * nav.cellSize + half;
+    return !collidesWithBulletsForPath(cx, cy, nav.radius, bullets);
   }
 
   function findNearestClearCell(nav, startCol, startRow, bullets, maxRing = 8) {
@@ -623,6 +809,7 @@ function createGameServer(io) {
     const dy = by - ay;
     const dist = Math.sqrt(dx * dx + dy * dy);
     if (dist < 1e-3) return true;
+    if (segmentClearForPath(ax, ay, bx, by, nav, bullets)) return true;
     const step = Math.max(4, nav.radius * 0.5);
     const steps = Math.max(1, Math.ceil(dist / step));
 
@@ -638,6 +825,30 @@ function createGameServer(io) {
     return true;
   }
 
+  // Conservative whole-segment check: true only if no sample directPathClear
+  // would march could be blocked, so the common open-line case skips the
+  // march entirely. A false result just falls back to sampling.
+  function segmentClearForPath(ax, ay, bx, by, nav, bullets) {
+    const radius = nav.radius;
+    const minX = radius;
+    const maxX = nav.width - radius;
+    const minY = radius;
+    const maxY = nav.height - radius;
+    if (ax < minX || ax > maxX || ay < minY || ay > maxY) return false;
+    if (bx < minX || bx > maxX || by < minY || by > maxY) return false;
+    if (segmentHitsAnyWall(ax, ay, bx, by, nav.walls, radius)) return false;
+    if (bullets && bullets.length > 0) {
+      const reach = BOT_CONFIG.playerRadius + radius;
+      const reachSq = reach * reach;
+      for (let i = 0; i < bullets.length; i++) {
+        const b = bullets[i];
+        if (!b || typeof b.x !== "number" || typeof b.y !== "number") continue;
+        if (distanceToSegmentSq(b.x, b.y, ax, ay, bx, by) < reachSq) return false;
+      }
+    }
+    return true;
+  }
+
   function isPositionBlockedForPath(x, y, nav, bullets) {
     const radius = nav.radius;
     if (
@@ -648,7 +859,7 @@ function createGameServer(io) {
     ) {
       return true;
     }
-    if (circleCollidesAnyWall(x, y, radius, nav.walls)) return true;
+    if (circleCollidesIndexedWalls(x, y, radius, nav.wallIndex)) return true;
     if (collidesWithBulletsForPath(x, y, radius, bullets)) return true;
     return false;
   }
@@ -723,26 +934,16 @@ function createGameServer(io) {
       ),
     };
 
-    const open = [
-      {
-        key: startKey,
-        f: fScore[startKey],
-        col: validStart.col,
-        row: validStart.row,
-      },
-    ];
-    const openSet = new Set([startKey]);
-
-    const directions = [
-      { dc: 1, dr: 0, cost: 1 },
-      { dc: -1, dr: 0, cost: 1 },
-      { dc: 0, dr: 1, cost: 1 },
-      { dc: 0, dr: -1, cost: 1 },
-      { dc: 1, dr: 1, cost: Math.SQRT2 },
-      { dc: -1, dr: 1, cost: Math.SQRT2 },
-      { dc: 1, dr: -1, cost: Math.SQRT2 },
-      { dc: -1, dr: -1, cost: Math.SQRT2 },
-    ];
+    const startNode = {
+      key: startKey,
+      f: fScore[startKey],
+      col: validStart.col,
+      row: validStart.row,
+    };
+    const open = [startNode];
+    // key -> node for everything in `open`, so re-scoring a neighbour that is
+    // already queued doesn't have to scan the open list.
+    const openNodes = new Map([[startKey, startNode]]);
 
     while (open.length > 0) {
       let bestIdx = 0;
@@ -752,14 +953,14 @@ function createGameServer(io) {
         }
       }
       const current = open.splice(bestIdx, 1)[0];
-      openSet.delete(current.key);
+      openNodes.delete(current.key);
 
       if (current.key === goalKey) {
         const rawPath = reconstructPath(cameFrom, current.key, nav);
         return smoothPath(rawPath, nav, bullets);
       }
 
-      for (const dir of directions) {
+      for (const dir of PATH_DIRECTIONS) {
         const nCol = current.col + dir.dc;
         const nRow = current.row + dir.dr;
         if (!isCellWithinBounds(nav, nCol, nRow)) continue;
@@ -783,14 +984,13 @@ function createGameServer(io) {
           tentativeG +
           Math.hypot(validGoal.col - nCol, validGoal.row - nRow);
 
-        if (!openSet.has(neighborKey)) {
-          open.push({ key: neighborKey, f: fScore[neighborKey], col: nCol, row: nRow });
-          openSet.add(neighborKey);
+        const existing = openNodes.get(neighborKey);
+        if (!existing) {
+          const node = { key: neighborKey, f: fScore[neighborKey], col: nCol, row: nRow };
+          open.push(node);
+          openNodes.set(neighborKey, node);
         } else {
-          const existing = open.find((n) => n.key === neighborKey);
-          if (existing) {
-            existing.f = fScore[neighborKey];
-          }
+          existing.f = fScore[neighborKey];
         }
       }
     }
@@ -890,12 +1090,14 @@ function createGameServer(io) {
       botState.navForcePath = true;
       botState.navPathNeedsRecalc = true;
     }
-    const traveledSinceCalc =
-      typeof botState.navLastCalcX === "number" && typeof botState.navLastCalcY === "number"
-        ? Math.hypot(bot.x - botState.navLastCalcX, bot.y - botState.navLastCalcY)
-        : 0;
+    let traveledSinceCalcSq = 0;
+    if (typeof botState.navLastCalcX === "number" && typeof botState.navLastCalcY === "number") {
+      const dxC = bot.x - botState.navLastCalcX;
+      const dyC = bot.y - botState.navLastCalcY;
+      traveledSinceCalcSq = dxC * dxC + dyC * dyC;
+    }
 
-    if (pathActive && traveledSinceCalc >= PATH_RECALC_TRAVEL) {
+    if (pathActive && traveledSinceCalcSq >= PATH_RECALC_TRAVEL * PATH_RECALC_TRAVEL) {
       botState.navPathNeedsRecalc = true;
     }
 
@@ -910,14 +1112,11 @@ function createGameServer(io) {
     } else {
       const dxL = bot.x - botState.navLingerAnchorX;
       const dyL = bot.y - botState.navLingerAnchorY;
-      const distL = Math.hypot(dxL, dyL);
-      if (distL > LINGER_RADIUS) {
-        console.log("RECHANGING ANCHOR!!!")
+      if (dxL * dxL + dyL * dyL > LINGER_RADIUS * LINGER_RADIUS) {
         botState.navLingerAnchorX = bot.x;
         botState.navLingerAnchorY = bot.y;
         botState.navLingerStart = now;
       } else if (now - (botState.navLingerStart || 0) >= LINGER_TIMEOUT_MS) {
-        console.log("RECALCULATING!!!")
         botState.navPathNeedsRecalc = true;
         botState.navForcePath = true;
         if (pathActive && botState.navPathIndex < botState.navPath.length - 1) {
@@ -1001,11 +1200,13 @@ function createGameServer(io) {
           typeof botState.navLastAcceptedAt === "number"
             ? botState.navLastAcceptedAt
             : 0;
-        const goalShift =
-          typeof botState.navLastGoalX === "number" &&
-          typeof botState.navLastGoalY === "number"
-            ? Math.hypot(target.x - botState.navLastGoalX, target.y - botState.navLastGoalY)
-            : Infinity;
+        let goalShifted = true;
+        if (typeof botState.navLastGoalX === "number" && typeof botState.navLastGoalY === "number") {
+          const dxG = target.x - botState.navLastGoalX;
+          const dyG = target.y - botState.navLastGoalY;
+          goalShifted =
+            dxG * dxG + dyG * dyG > GOAL_SHIFT_REPLAN_DIST * GOAL_SHIFT_REPLAN_DIST;
+        }
         const blockedRecently =
           typeof botState.navLastBlockedAt === "number" &&
           now - botState.navLastBlockedAt < PATH_RETRY_MS * 2;
@@ -1018,17 +1219,17 @@ function createGameServer(io) {
         const improved =
           !pathActive ||
           newCost < currentCost * PATH_IMPROVEMENT_RATIO ||
-          goalShift > GOAL_SHIFT_REPLAN_DIST ||
+          goalShifted ||
           blockedRecently;
 
         const shouldReplace =
           botState.navForcePath ||
           !pathActive ||
-          goalShift > GOAL_SHIFT_REPLAN_DIST ||
+          goalShifted ||
           blockedRecently ||
           (improved && cooldownMet);
 
-        if (shouldReplace && (!locked || botState.navForcePath || blockedRecently || goalShift > GOAL_SHIFT_REPLAN_DIST)) {
+        if (shouldReplace && (!locked || botState.navForcePath || blockedRecently || goalShifted)) {
           botState.navPath = path;
           botState.navPathIndex = path.length > 1 ? 1 : 0;
           botState.navPathNeedsRecalc = false;
@@ -1120,21 +1321,19 @@ function createGameServer(io) {
       return;
     }
 
-    const shooterWeapon =
-      shooter && shooter.weapon && WEAPONS[shooter.weapon]
-        ? WEAPONS[shooter.weapon]
-        : null;
+    const shooterStats =
+      (shooter && shooter.weapon && WEAPON_STATS[shooter.weapon]) || null;
     const speed =
       typeof bulletData.speed === "number"
         ? bulletData.speed
-        : shooterWeapon && typeof shooterWeapon.bulletSpeed === "number"
-          ? shooterWeapon.bulletSpeed
+        : shooterStats
+          ? shooterStats.speed
           : DEFAULT_BULLET_SPEED;
     const radius =
       typeof bulletData.radius === "number"
         ? bulletData.radius
-        : shooterWeapon && typeof shooterWeapon.bulletRadius === "number"
-          ? shooterWeapon.bulletRadius
+        : shooterStats
+          ? shooterStats.radius
           : DEFAULT_BULLET_RADIUS;
 
     const createdAt = Date.now();
@@ -1171,6 +1370,8 @@ function createGameServer(io) {
   }
 
   function advanceActiveBullets(now, walls) {
+    // The wall index is built once per layout alongside the nav grid.
+    const wallIndex = activeBullets.length > 0 ? getNavGrid(walls).wallIndex : null;
     for (let i = activeBullets.length - 1; i >= 0; i--) {
       const b = activeBullets[i];
       if (!b) {
@@ -1196,9 +1397,10 @@ function createGameServer(io) {
         b.x > BOT_CONFIG.canvasWidth + b.radius ||
         b.y < -b.radius ||
         b.y > BOT_CONFIG.canvasHeight + b.radius;
+      // Sweep the whole step analytically so fast bullets can't skip walls.
       const hitWall =
-        circleCollidesAnyWall(b.x, b.y, b.radius, walls) ||
-        segmentCrossesWallDiscrete(prevX, prevY, b.x, b.y, walls, 2);
+        circleCollidesIndexedWalls(b.x, b.y, b.radius, wallIndex) ||
+        segmentHitsIndexedWalls(prevX, prevY, b.x, b.y, wallIndex);
 
       if (agedOut || outOfBounds || hitWall) {
         activeBullets.splice(i, 1);
@@ -1236,19 +1438,17 @@ function createGameServer(io) {
       const sqrtDisc = Math.sqrt(disc);
       const t1 = (-bCoef - sqrtDisc) / (2 * vDotV);
       const t2 = (-bCoef + sqrtDisc) / (2 * vDotV);
-      const times = [t1, t2].filter((t) => t >= 0 && Number.isFinite(t));
-      if (times.length === 0) continue;
-      const tHit = Math.min(...times);
+      // vDotV > 0 so t1 <= t2: the earliest non-negative root is t1 unless
+      // the bullet has already entered the bot's radius.
+      const tHit = t1 >= 0 ? t1 : t2;
+      if (!(tHit >= 0) || !Number.isFinite(tHit)) continue;
       if (tHit > maxLookaheadSec) continue;
       // rel dot v < 0 means bullet is moving toward the bot
       if (bCoef >= 0) continue;
 
       const hitX = b.x + b.vx * tHit;
       const hitY = b.y + b.vy * tHit;
-      if (
-        segmentCrossesWallDiscrete(b.x, b.y, hitX, hitY, walls, 2) ||
-        lineIntersectsAnyWall(b.x, b.y, hitX, hitY, walls)
-      ) {
+      if (segmentHitsAnyWall(b.x, b.y, hitX, hitY, walls)) {
         continue;
       }
 
@@ -1309,11 +1509,9 @@ function createGameServer(io) {
         alive: true,
         health: MAX_HEALTH,
         isBot: true,
-        botState: {
-          lastShotAt: 0,
-        },
+        botState: createBotState(),
       };
-      activePlayers.push(bot);
+      addActivePlayer(bot);
     }
   }
 
@@ -1352,11 +1550,12 @@ function createGameServer(io) {
         const sqrtDisc = Math.sqrt(disc);
         const t1 = (-b - sqrtDisc) / (2 * a);
         const t2 = (-b + sqrtDisc) / (2 * a);
-        const candidates = [t1, t2].filter(
-          (val) => val > 0 && Number.isFinite(val),
-        );
-        if (candidates.length > 0) {
-          t = Math.min(...candidates);
+        // Smallest positive finite root, without building a temp array.
+        let best = Infinity;
+        if (t1 > 0 && t1 < best) best = t1;
+        if (t2 > 0 && t2 < best) best = t2;
+        if (best !== Infinity) {
+          t = best;
         }
       }
     }
@@ -1377,7 +1576,35 @@ function createGameServer(io) {
     };
   }
 
-  function computeScriptedBotAction(bot, players, walls) {
+  // Walls are static for a match, so a wall-only line test can only change
+  // when an endpoint moves. Memoise the last answer per bot and slot so
+  // idle bots and stationary targets skip the wall scan.
+  function isLineBlockedCached(botState, slot, x0, y0, x1, y1, walls) {
+    const cache = botState.losCache || (botState.losCache = {});
+    let entry = cache[slot];
+    if (
+      entry &&
+      entry.version === wallLayoutVersion &&
+      entry.x0 === x0 &&
+      entry.y0 === y0 &&
+      entry.x1 === x1 &&
+      entry.y1 === y1
+    ) {
+      return entry.blocked;
+    }
+    if (!entry) {
+      entry = cache[slot] = {};
+    }
+    entry.version = wallLayoutVersion;
+    entry.x0 = x0;
+    entry.y0 = y0;
+    entry.x1 = x1;
+    entry.y1 = y1;
+    entry.blocked = lineIntersectsAnyWall(x0, y0, x1, y1, walls);
+    return entry.blocked;
+  }
+
+  function computeScriptedBotAction(bot, players, walls, threatBullets) {
     if (!bot || !bot.alive) {
       return {
         moveX: 0,
@@ -1391,7 +1618,7 @@ function createGameServer(io) {
     const botState =
       bot.botState && typeof bot.botState === "object"
         ? bot.botState
-        : (bot.botState = {});
+        : (bot.botState = createBotState());
     const prevHealth =
       typeof botState.lastHealth === "number" ? botState.lastHealth : bot.health;
     const tookDamage = bot.health < prevHealth;
@@ -1551,10 +1778,7 @@ function createGameServer(io) {
       botState.strafeChargeDirY = 0;
     }
 
-    const weaponCfg = WEAPONS[BOT_CONFIG.weaponKey] || {};
-    const bulletSpeed =
-      typeof weaponCfg.bulletSpeed === "number" ? weaponCfg.bulletSpeed : 10;
-    const bulletSpeedPerSec = bulletSpeed * 60; // approximate client frame rate
+    const bulletSpeedPerSec = BOT_WEAPON.speed * 60; // approximate client frame rate
 
     const targetMemory =
       botState.targetMemory && typeof botState.targetMemory === "object"
@@ -1600,13 +1824,10 @@ function createGameServer(io) {
       (Math.random() - 0.5) * 2 * BOT_CONFIG.aimInaccuracy;
     aimAngle += inaccuracy;
 
-    const moveTargetX = target.x;
-    const moveTargetY = target.y;
-    const moveDx = moveTargetX - bot.x;
-    const moveDy = moveTargetY - bot.y;
-    const moveDist = Math.sqrt(moveDx * moveDx + moveDy * moveDy) || 1e-6;
-    const moveDirX = moveDx / moveDist;
-    const moveDirY = moveDy / moveDist;
+    // Movement heads for the target itself, so reuse the vector from above.
+    const moveDist = dist;
+    const moveDirX = dirX;
+    const moveDirY = dirY;
 
     const desiredDistance = 220;
     const distanceBand = 40;
@@ -1637,7 +1858,9 @@ function createGameServer(io) {
       strafeDirUsed = botState.strafeDir;
     }
 
-    const hasLineOfSight = !lineIntersectsAnyWall(
+    const hasLineOfSight = !isLineBlockedCached(
+      botState,
+      "aim",
       bot.x,
       bot.y,
       aimTargetX,
@@ -1681,13 +1904,19 @@ function createGameServer(io) {
     // Detect when we're trying to peek past a wall (line of sight blocked) and
     // repeatedly bouncing off bullet dodges. In that case, temporarily ignore
     // bullet-dodge logic so the bot can push through the bullet stream.
-    const lineBlockedToTarget = lineIntersectsAnyWall(
-      bot.x,
-      bot.y,
-      target.x,
-      target.y,
-      walls,
-    );
+    // Without a lead the aim line *is* the target line; reuse that answer.
+    const lineBlockedToTarget =
+      aimTargetX === target.x && aimTargetY === target.y
+        ? !hasLineOfSight
+        : isLineBlockedCached(
+            botState,
+            "target",
+            bot.x,
+            bot.y,
+            target.x,
+            target.y,
+            walls,
+          );
     const pushActive =
       !navigationFocused &&
       typeof botState.pushThroughUntil === "number" &&
@@ -1702,7 +1931,7 @@ function createGameServer(io) {
     }
 
     // Dodge incoming bullets from human players by strafing perpendicular to the shot.
-    const threat = findIncomingBulletThreat(bot, activeBullets, walls);
+    const threat = findIncomingBulletThreat(bot, threatBullets, walls);
     const DODGE_DURATION_MS = 650;
     let dodging = isDodgingActive;
 
@@ -1769,8 +1998,10 @@ function createGameServer(io) {
       threat.bullet.id !== botState.lastDodgedBulletId
     ) {
       const incoming = threat.incomingAngle;
-      const left = { x: -Math.sin(incoming), y: Math.cos(incoming) };
-      const right = { x: Math.sin(incoming), y: -Math.cos(incoming) };
+      const cosIn = Math.cos(incoming);
+      const sinIn = Math.sin(incoming);
+      const left = { x: -sinIn, y: cosIn };
+      const right = { x: sinIn, y: -cosIn };
 
       function scoreDodge(dir) {
         const step = BOT_CONFIG.moveSpeedPerTick * 3;
@@ -1912,23 +2143,11 @@ function createGameServer(io) {
 
   function fireBulletFromBot(bot) {
     if (!bot || !bot.alive) return false;
-    const weaponCfg = WEAPONS[BOT_CONFIG.weaponKey] || {};
-    const weaponLength =
-      typeof weaponCfg.weaponLength === "number"
-        ? weaponCfg.weaponLength
-        : 30;
-    const bulletSpeed =
-      typeof weaponCfg.bulletSpeed === "number" ? weaponCfg.bulletSpeed : null;
-    const bulletRadius =
-      typeof weaponCfg.bulletRadius === "number" ? weaponCfg.bulletRadius : null;
+    const { weaponLength, speed, radius } = BOT_WEAPON;
     const tipX = bot.x + Math.cos(bot.angle) * weaponLength;
     const tipY = bot.y + Math.sin(bot.angle) * weaponLength;
 
-    if (
-      isPointInsideAnyWall(tipX, tipY, gameWalls) ||
-      segmentCrossesWallDiscrete(bot.x, bot.y, tipX, tipY, gameWalls, 2) ||
-      lineIntersectsAnyWall(bot.x, bot.y, tipX, tipY, gameWalls)
-    ) {
+    if (segmentHitsAnyWall(bot.x, bot.y, tipX, tipY, gameWalls)) {
       return false;
     }
 
@@ -1938,8 +2157,8 @@ function createGameServer(io) {
       y: tipY,
       angle: bot.angle,
       playerId: bot.id,
-      speed: bulletSpeed ?? undefined,
-      radius: bulletRadius ?? undefined,
+      speed,
+      radius,
     };
 
     io.emit("newBullet", bullet);
@@ -1980,13 +2199,19 @@ function createGameServer(io) {
         );
         const distX = bot.x - closestX;
         const distY = bot.y - closestY;
-        const distance = Math.sqrt(distX * distX + distY * distY);
-
-        if (distance < radius) {
-          const overlap = radius - distance;
-          const pushAngle = Math.atan2(distY, distX);
-          bot.x += Math.cos(pushAngle) * overlap;
-          bot.y += Math.sin(pushAngle) * overlap;
+        const distSq = distX * distX + distY * distY;
+
+        if (distSq < radius * radius) {
+          const distance = Math.sqrt(distSq);
+          if (distance > 0) {
+            // Push out along the contact normal (distX, distY) / distance.
+            const push = (radius - distance) / distance;
+            bot.x += distX * push;
+            bot.y += distY * push;
+          } else {
+            // Centre is inside the wall; atan2(0, 0) used to push along +x.
+            bot.x += radius;
+          }
         }
       }
 
@@ -2000,10 +2225,10 @@ function createGameServer(io) {
     }
 
     if (action.shoot) {
-      const botState = bot.botState || (bot.botState = {});
+      const botState = bot.botState || (bot.botState = createBotState());
       const lastShotAt =
         typeof botState.lastShotAt === "number" ? botState.lastShotAt : 0;
-      if (now - lastShotAt >= WEAPONS[BOT_CONFIG.weaponKey].cooldownMs * (2 - 1)) {
+      if (now - lastShotAt >= BOT_WEAPON.cooldownMs) {
         if (fireBulletFromBot(bot)) {
           botState.lastShotAt = now;
         }
@@ -2015,18 +2240,38 @@ function createGameServer(io) {
 
   function runBotsTick() {
     if (!gameInProgress.status) return;
+    // Once the match is decided there is nothing left for bots to react to,
+    // so skip the bullet/pathing/AI work until the reset.
+    if (gameOverTimeout) return;
     if (!Array.isArray(activePlayers) || activePlayers.length === 0) return;
 
-    const bots = activePlayers.filter((p) => p && p.isBot && p.alive);
+    // One pass splits the roster into acting bots and the humans they can
+    // target, so each bot's target search skips bots and the dead.
+    const bots = [];
+    const targets = [];
+    for (const p of activePlayers) {
+      if (!p || !p.alive) continue;
+      if (p.isBot) {
+        bots.push(p);
+      } else {
+        targets.push(p);
+      }
+    }
     if (bots.length === 0) return;
 
-    const snapshotPlayers = activePlayers.slice();
     const now = Date.now();
     advanceActiveBullets(now, gameWalls);
     let anyBotMoved = false;
 
+    // Only human bullets can threaten bots; filter them once per tick rather
+    // than having every bot walk the (mostly bot-fired) bullet list.
+    const threatBullets = [];
+    for (const b of activeBullets) {
+      if (b && !b.shooterIsBot) threatBullets.push(b);
+    }
+
     for (const bot of bots) {
-      const action = computeScriptedBotAction(bot, snapshotPlayers, gameWalls);
+      const action = computeScriptedBotAction(bot, targets, gameWalls, threatBullets);
       const moved = applyBotAction(bot, action, now);
       if (moved) {
         anyBotMoved = true;
@@ -2034,7 +2279,7 @@ function createGameServer(io) {
     }
 
     if (anyBotMoved) {
-      io.emit("gameState", activePlayers);
+      emitGameState();
     }
   }
 
@@ -2046,6 +2291,7 @@ function createGameServer(io) {
     activePlayers,
     gameWalls,
     gameInProgress,
+    emitGameState,
   };
 }
 
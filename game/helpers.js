@@ -1,4 +1,12 @@
 const { DEFAULT_SKIN_BY_WEAPON } = require("../lib/skins");
+const {
+  lineIntersectsAnyWall,
+  segmentIntersectsRect,
+  segmentHitsAnyWall,
+  distanceToLineSq,
+  distanceToSegmentSq,
+  circleCollidesAnyWall,
+} = require("../public/geometry");
 
 function isBotAlliedName(name) {
   if (typeof name !== "string") return false;
@@ -29,92 +37,6 @@ function isBotAllyPlayer(player) {
   return isBotAlliedName(displayName);
 }
 
-function isPointInsideAnyWall(x, y, walls) {
-  for (const wall of walls) {
-    if (
-      x >= wall.x &&
-      x <= wall.x + wall.width &&
-      y >= wall.y &&
-      y <= wall.y + wall.height
-    ) {
-      return true;
-    }
-  }
-  return false;
-}
-
-function segmentsIntersect(x1, y1, x2, y2, x3, y3, x4, y4) {
-  const den = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4);
-  if (den === 0) return false;
-  const t = ((x1 - x3) * (y3 - y4) - (y1 - y3) * (x3 - x4)) / den;
-  const u = ((x1 - x3) * (y1 - y2) - (y1 - y3) * (x1 - x2)) / den;
-  return t >= 0 && t <= 1 && u >= 0 && u <= 1;
-}
-
-function lineIntersectsRect(x0, y0, x1, y1, rect) {
-  if (
-    (x0 >= rect.x && x0 <= rect.x + rect.width && y0 >= rect.y && y0 <= rect.y + rect.height) ||
-    (x1 >= rect.x && x1 <= rect.x + rect.width && y1 >= rect.y && y1 <= rect.y + rect.height)
-  ) return true;
-  const r = rect;
-  const edges = [
-    [r.x, r.y, r.x + r.width, r.y],
-    [r.x + r.width, r.y, r.x + r.width, r.y + r.height],
-    [r.x + r.width, r.y + r.height, r.x, r.y + r.height],
-    [r.x, r.y + r.height, r.x, r.y],
-  ];
-  for (const [ex0, ey0, ex1, ey1] of edges) {
-    if (segmentsIntersect(x0, y0, x1, y1, ex0, ey0, ex1, ey1)) return true;
-  }
-  return false;
-}
-
-function lineIntersectsAnyWall(x0, y0, x1, y1, walls) {
-  for (const wall of walls) {
-    if (lineIntersectsRect(x0, y0, x1, y1, wall)) return true;
-  }
-  return false;
-}
-
-function segmentCrossesWallDiscrete(x0, y0, x1, y1, walls, step = 2) {
-  const dx = x1 - x0;
-  const dy = y1 - y0;
-  const len = Math.sqrt(dx * dx + dy * dy);
-  if (len === 0) return false;
-  const steps = Math.max(1, Math.ceil(len / step));
-  for (let i = 1; i <= steps; i++) {
-    const t = i / steps;
-    const px = x0 + dx * t;
-    const py = y0 + dy * t;
-    if (isPointInsideAnyWall(px, py, walls)) return true;
-  }
-  return false;
-}
-
-function distanceToLineSq(px, py, x0, y0, vx, vy) {
-  const denom = vx * vx + vy * vy;
-  if (denom < 1e-9) return Infinity;
-  const t = ((px - x0) * vx + (py - y0) * vy) / denom;
-  const closestX = x0 + vx * t;
-  const closestY = y0 + vy * t;
-  const dx = px - closestX;
-  const dy = py - closestY;
-  return dx * dx + dy * dy;
-}
-
-function circleCollidesAnyWall(cx, cy, radius, walls) {
-  for (const wall of walls) {
-    const closestX = Math.max(wall.x, Math.min(cx, wall.x + wall.width));
-    const closestY = Math.max(wall.y, Math.min(cy, wall.y + wall.height));
-    const dx = cx - closestX;
-    const dy = cy - closestY;
-    if (Math.sqrt(dx * dx + dy * dy) < radius) {
-      return true;
-    }
-  }
-  return false;
-}
-
 function worldToGrid(x, y, nav) {
   const col = Math.floor(x / nav.cellSize);
   const row = Math.floor(y / nav.cellSize);
@@ -138,19 +60,77 @@ function isCellWithinBounds(nav, col, row) {
   return col >= 0 && row >= 0 && col < nav.cols && row < nav.rows;
 }
 
+// Uniform-grid broad phase for walls: each cell lists the walls whose rect
+// overlaps it, so circle queries only test walls near the query point.
+function buildWallIndex(walls, width, height, cellSize = 100) {
+  const cols = Math.max(1, Math.ceil(width / cellSize));
+  const rows = Math.max(1, Math.ceil(height / cellSize));
+  const cells = new Array(cols * rows);
+  for (let i = 0; i < cells.length; i++) {
+    cells[i] = [];
+  }
+  for (const wall of walls) {
+    const c0 = Math.max(0, Math.floor(wall.x / cellSize));
+    const c1 = Math.min(cols - 1, Math.floor((wall.x + wall.width) / cellSize));
+    const r0 = Math.max(0, Math.floor(wall.y / cellSize));
+    const r1 = Math.min(rows - 1, Math.floor((wall.y + wall.height) / cellSize));
+    for (let r = r0; r <= r1; r++) {
+      for (let c = c0; c <= c1; c++) {
+        cells[r * cols + c].push(wall);
+      }
+    }
+  }
+  return { cellSize, cols, rows, cells };
+}
+
+function circleCollidesIndexedWalls(cx, cy, radius, index) {
+  const { cellSize, cols, rows, cells } = index;
+  const c0 = Math.max(0, Math.floor((cx - radius) / cellSize));
+  const c1 = Math.min(cols - 1, Math.floor((cx + radius) / cellSize));
+  const r0 = Math.max(0, Math.floor((cy - radius) / cellSize));
+  const r1 = Math.min(rows - 1, Math.floor((cy + radius) / cellSize));
+  for (let r = r0; r <= r1; r++) {
+    for (let c = c0; c <= c1; c++) {
+      // A wall spanning several cells may be tested twice; harmless for a
+      // yes/no query and cheaper than de-duplicating.
+      if (circleCollidesAnyWall(cx, cy, radius, cells[r * cols + c])) return true;
+    }
+  }
+  return false;
+}
+
+// Segment query over the same index: visits the cells under the segment's
+// (padded) bounding box. Meant for short segments such as one bullet step;
+// long sight lines are cheaper against the plain wall list.
+function segmentHitsIndexedWalls(x0, y0, x1, y1, index, pad = 0) {
+  const { cellSize, cols, rows, cells } = index;
+  const c0 = Math.max(0, Math.floor((Math.min(x0, x1) - pad) / cellSize));
+  const c1 = Math.min(cols - 1, Math.floor((Math.max(x0, x1) + pad) / cellSize));
+  const r0 = Math.max(0, Math.floor((Math.min(y0, y1) - pad) / cellSize));
+  const r1 = Math.min(rows - 1, Math.floor((Math.max(y0, y1) + pad) / cellSize));
+  for (let r = r0; r <= r1; r++) {
+    for (let c = c0; c <= c1; c++) {
+      if (segmentHitsAnyWall(x0, y0, x1, y1, cells[r * cols + c], pad)) return true;
+    }
+  }
+  return false;
+}
+
 module.exports = {
   isBotAlliedName,
   hasDefaultSkin,
   isBotAllyPlayer,
-  isPointInsideAnyWall,
-  segmentsIntersect,
-  lineIntersectsRect,
   lineIntersectsAnyWall,
-  segmentCrossesWallDiscrete,
+  segmentIntersectsRect,
+  segmentHitsAnyWall,
   distanceToLineSq,
+  distanceToSegmentSq,
   circleCollidesAnyWall,
   worldToGrid,
   gridToWorld,
   cellKey,
   isCellWithinBounds,
+  buildWallIndex,
+  circleCollidesIndexedWalls,
+  segmentHitsIndexedWalls,
 };
@@ -12,6 +12,7 @@ let keys = {};
 let gameActive = false;
 let firingInterval = null;
 let lastShotAt = 0;
+let localWeapon = null;
 
 // Constants
 const PLAYER_RADIUS = 20;
@@ -25,6 +26,7 @@ function initGame(gamePlayers, gameWalls) {
   players = gamePlayers;
   walls = gameWalls;
   localPlayer = players.find((p) => p.id === socket.id);
+  localWeapon = resolveWeaponStats(localPlayer ? localPlayer.weapon : null);
   bullets = [];
   gameActive = true;
 
@@ -49,6 +51,21 @@ function initGame(gamePlayers, gameWalls) {
   updateGameInfo();
 }
 
+// The local weapon can't change mid-match, so resolve its stats once here
+// instead of on every shot.
+function resolveWeaponStats(playerWeapon) {
+  const weaponKey = playerWeapon || (typeof DEFAULT_WEAPON_KEY !== 'undefined' ? DEFAULT_WEAPON_KEY : 'pistol');
+  const cfg = (typeof WEAPONS !== 'undefined' && WEAPONS[weaponKey]) || WEAPONS.pistol;
+  return {
+    automatic: !!(cfg && cfg.automatic),
+    fireIntervalMs: Math.max(50, (cfg && cfg.cooldownMs) || 100),
+    cooldownMs: cfg && typeof cfg.cooldownMs === 'number' ? cfg.cooldownMs : 0,
+    weaponLength: cfg && typeof cfg.weaponLength === 'number' ? cfg.weaponLength : WEAPON_LENGTH,
+    bulletSpeed: cfg && typeof cfg.bulletSpeed === 'number' ? cfg.bulletSpeed : BULLET_SPEED,
+    bulletRadius: cfg && typeof cfg.bulletRadius === 'number' ? cfg.bulletRadius : BULLET_RADIUS,
+  };
+}
+
 // Game loop
 function gameLoop() {
   if (!gameActive) return;
@@ -97,18 +114,22 @@ function update() {
         // Calculate the distance between the player's center and the closest point
         const distX = localPlayer.x - closestX;
         const distY = localPlayer.y - closestY;
-        const distance = Math.sqrt(distX * distX + distY * distY);
+        const distSq = distX * distX + distY * distY;
 
         // If the distance is less than the player's radius, there's a collision
-        if (distance < PLAYER_RADIUS) {
+        if (distSq < PLAYER_RADIUS * PLAYER_RADIUS) {
+          const distance = Math.sqrt(distSq);
           // Calculate the overlap between the player and the wall
           const overlap = PLAYER_RADIUS - distance;
-          // Calculate the angle to push the player out of the wall
-          const pushAngle = Math.atan2(distY, distX);
 
-          // Move the player out of the wall
-          localPlayer.x += Math.cos(pushAngle) * overlap;
-          localPlayer.y += Math.sin(pushAngle) * overlap;
+          // Move the player out of the wall along the contact normal
+          if (distance > 0) {
+            localPlayer.x += (distX / distance) * overlap;
+            localPlayer.y += (distY / distance) * overlap;
+          } else {
+            // Centre is inside the wall; atan2(0, 0) used to push along +x.
+            localPlayer.x += overlap;
+          }
         }
       }
 
@@ -139,17 +160,14 @@ function update() {
 function updateBullets() {
   for (let i = bullets.length - 1; i >= 0; i--) {
     const bullet = bullets[i];
-    const speed = typeof bullet.speed === 'number' ? bullet.speed : BULLET_SPEED;
     const bRadius = typeof bullet.radius === 'number' ? bullet.radius : BULLET_RADIUS;
-    const shooter =
-      bullet && bullet.playerId
-        ? players.find((p) => p.id === bullet.playerId)
-        : null;
-    const shooterIsBot = !!(shooter && shooter.isBot);
+    const shooterIsBot = !!bullet.shooterIsBot;
 
     // Move bullet
-    bullet.x += Math.cos(bullet.angle) * speed;
-    bullet.y += Math.sin(bullet.angle) * speed;
+    const prevX = bullet.x;
+    const prevY = bullet.y;
+    bullet.x += bullet.stepX;
+    bullet.y += bullet.stepY;
 
     // Check if bullet is out of bounds
     if (
@@ -162,8 +180,11 @@ function updateBullets() {
       continue;
     }
 
-    // Check wall collisions
-    if (checkWallCollision(bullet.x, bullet.y, bRadius)) {
+    // Check wall collisions along the whole step so fast bullets can't tunnel
+    if (
+      circleCollidesAnyWall(bullet.x, bullet.y, bRadius, walls) ||
+      segmentHitsAnyWall(prevX, prevY, bullet.x, bullet.y, walls)
+    ) {
       bullets.splice(i, 1);
       continue;
     }
@@ -176,11 +197,19 @@ function updateBullets() {
           continue;
         }
 
-        const dx = player.x - bullet.x;
-        const dy = player.y - bullet.y;
-        const distance = Math.sqrt(dx * dx + dy * dy);
+        // Sweep the bullet's step against the player so small targets
+        // can't be skipped over between frames.
+        const hitRadius = PLAYER_RADIUS + bRadius;
+        const distSq = distanceToSegmentSq(
+          player.x,
+          player.y,
+          prevX,
+          prevY,
+          bullet.x,
+          bullet.y,
+        );
 
-        if (distance < PLAYER_RADIUS + bRadius) {
+        if (distSq < hitRadius * hitRadius) {
           // Player hit
           socket.emit("playerHit", {
             targetId: player.id,
@@ -269,14 +298,7 @@ function render() {
 
   // Draw bullets
   for (const bullet of bullets) {
-    let fill = "black";
-    if (typeof getBulletColorForPlayer === "function" && bullet.playerId) {
-      const shooter = players.find((p) => p.id === bullet.playerId);
-      if (shooter) {
-        fill = getBulletColorForPlayer(shooter) || fill;
-      }
-    }
-    ctx.fillStyle = fill;
+    ctx.fillStyle = bullet.fill;
     ctx.beginPath();
     const r = typeof bullet.radius === 'number' ? bullet.radius : BULLET_RADIUS;
     ctx.arc(bullet.x, bullet.y, r, 0, Math.PI * 2);
@@ -322,12 +344,9 @@ function handleMouseMove(e) {
 function handleMouseDown() {
   if (!localPlayer || !localPlayer.alive || !gameActive) return;
   attemptFire();
-  const weaponKey = localPlayer.weapon || (typeof DEFAULT_WEAPON_KEY !== 'undefined' ? DEFAULT_WEAPON_KEY : 'pistol');
-  const cfg = (typeof WEAPONS !== 'undefined' && WEAPONS[weaponKey]) || WEAPONS.pistol;
-  if (cfg && cfg.automatic) {
-    const interval = Math.max(50, cfg.cooldownMs || 100);
+  if (localWeapon.automatic) {
     clearInterval(firingInterval);
-    firingInterval = setInterval(attemptFire, interval);
+    firingInterval = setInterval(attemptFire, localWeapon.fireIntervalMs);
   }
 }
 
@@ -340,26 +359,16 @@ function handleMouseUp() {
 
 function attemptFire() {
   if (!localPlayer || !localPlayer.alive || !gameActive) return;
-  const weaponKey = localPlayer.weapon || (typeof DEFAULT_WEAPON_KEY !== 'undefined' ? DEFAULT_WEAPON_KEY : 'pistol');
-  const cfg = (typeof WEAPONS !== 'undefined' && WEAPONS[weaponKey]) || WEAPONS.pistol;
+  const { cooldownMs, weaponLength, bulletSpeed, bulletRadius } = localWeapon;
   const now = Date.now();
-  const cooldown = cfg && typeof cfg.cooldownMs === 'number' ? cfg.cooldownMs : 0;
-  if (cooldown > 0 && now - lastShotAt < cooldown) return;
-
-  const weaponLength = cfg && typeof cfg.weaponLength === 'number' ? cfg.weaponLength : WEAPON_LENGTH;
-  const bulletSpeed = cfg && typeof cfg.bulletSpeed === 'number' ? cfg.bulletSpeed : BULLET_SPEED;
-  const bulletRadius = cfg && typeof cfg.bulletRadius === 'number' ? cfg.bulletRadius : BULLET_RADIUS;
+  if (cooldownMs > 0 && now - lastShotAt < cooldownMs) return;
 
   // Compute weapon tip position (spawn point)
   const tipX = localPlayer.x + Math.cos(localPlayer.angle) * weaponLength;
   const tipY = localPlayer.y + Math.sin(localPlayer.angle) * weaponLength;
 
-  // Prevent firing if the barrel path crosses or starts inside any wall
-  if (
-    barrelPathHitsWallDiscrete(localPlayer.x, localPlayer.y, tipX, tipY, 2) ||
-    barrelIntersectsAnyWall(localPlayer.x, localPlayer.y, tipX, tipY) ||
-    isPointInsideAnyWall(tipX, tipY)
-  ) {
+  // Prevent firing if the barrel path crosses or ends inside any wall
+  if (segmentHitsAnyWall(localPlayer.x, localPlayer.y, tipX, tipY, walls)) {
     return;
   }
 
@@ -376,98 +385,6 @@ function attemptFire() {
   lastShotAt = now;
 }
 
-// Check wall collision
-function checkWallCollision(x, y, radius) {
-  for (const wall of walls) {
-    // Find closest point on wall to the circle
-    const closestX = Math.max(wall.x, Math.min(x, wall.x + wall.width));
-    const closestY = Math.max(wall.y, Math.min(y, wall.y + wall.height));
-
-    // Calculate distance between circle center and closest point
-    const distX = x - closestX;
-    const distY = y - closestY;
-    const distance = Math.sqrt(distX * distX + distY * distY);
-
-    // Check collision
-    if (distance < radius) {
-      return true;
-    }
-  }
-  return false;
-}
-
-// Simple point-in-rectangle check for walls
-function isPointInsideAnyWall(x, y) {
-  for (const wall of walls) {
-    if (
-      x >= wall.x &&
-      x <= wall.x + wall.width &&
-      y >= wall.y &&
-      y <= wall.y + wall.height
-    ) {
-      return true;
-    }
-  }
-  return false;
-}
-
-// Check if the line segment from (x0,y0) to (x1,y1) intersects any wall
-function barrelIntersectsAnyWall(x0, y0, x1, y1) {
-  for (const wall of walls) {
-    if (lineIntersectsRect(x0, y0, x1, y1, wall)) return true;
-  }
-  return false;
-}
-
-function lineIntersectsRect(x0, y0, x1, y1, rect) {
-  // If either endpoint is inside, it's intersecting
-  if (
-    x0 >= rect.x && x0 <= rect.x + rect.width &&
-    y0 >= rect.y && y0 <= rect.y + rect.height
-  ) return true;
-  if (
-    x1 >= rect.x && x1 <= rect.x + rect.width &&
-    y1 >= rect.y && y1 <= rect.y + rect.height
-  ) return true;
-
-  // Check segment against each rectangle edge
-  const r = rect;
-  const edges = [
-    [r.x, r.y, r.x + r.width, r.y],
-    [r.x + r.width, r.y, r.x + r.width, r.y + r.height],
-    [r.x + r.width, r.y + r.height, r.x, r.y + r.height],
-    [r.x, r.y + r.height, r.x, r.y],
-  ];
-  for (const [ex0, ey0, ex1, ey1] of edges) {
-    if (segmentsIntersect(x0, y0, x1, y1, ex0, ey0, ex1, ey1)) return true;
-  }
-  return false;
-}
-
-function segmentsIntersect(x1, y1, x2, y2, x3, y3, x4, y4) {
-  const den = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4);
-  if (den === 0) return false; // parallel lines
-  const t = ((x1 - x3) * (y3 - y4) - (y1 - y3) * (x3 - x4)) / den;
-  const u = ((x1 - x3) * (y1 - y2) - (y1 - y3) * (x1 - x2)) / den;
-  return t >= 0 && t <= 1 && u >= 0 && u <= 1;
-}
-
-// Robust discrete raycast along barrel path
-function barrelPathHitsWallDiscrete(x0, y0, x1, y1, step = 2) {
-  const dx = x1 - x0;
-  const dy = y1 - y0;
-  const len = Math.sqrt(dx * dx + dy * dy);
-  if (len === 0) return false;
-  const steps = Math.max(1, Math.ceil(len / step));
-  for (let i = 1; i <= steps; i++) {
-    const t = i / steps;
-    const px = x0 + dx * t;
-    const py = y0 + dy * t;
-    if (isPointInsideAnyWall(px, py)) return true;
-  }
-  return false;
-}
-
 // Update game info
 function updateGameInfo() {
   const alivePlayers = players.filter((p) => p.alive);
@@ -481,6 +398,21 @@ socket.on("gameState", (updatedPlayers) => {
 });
 
 socket.on("newBullet", (bulletData) => {
+  // Resolve the shooter once on arrival instead of scanning players for
+  // every bullet on every frame.
+  const shooter = bulletData.playerId
+    ? players.find((p) => p.id === bulletData.playerId)
+    : null;
+  bulletData.shooterIsBot = !!(shooter && shooter.isBot);
+  bulletData.fill =
+    (shooter &&
+      typeof getBulletColorForPlayer === "function" &&
+      getBulletColorForPlayer(shooter)) ||
+    "black";
+  // Heading never changes in flight, so take cos/sin once here.
+  const speed = typeof bulletData.speed === 'number' ? bulletData.speed : BULLET_SPEED;
+  bulletData.stepX = Math.cos(bulletData.angle) * speed;
+  bulletData.stepY = Math.sin(bulletData.angle) * speed;
   bullets.push(bulletData);
 });
 
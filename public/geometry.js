@@ -0,0 +1,120 @@
+// Wall/segment geometry shared by the server and the browser client.
+// Walls are axis-aligned rects: { x, y, width, height }.
+
+// Slab test: clip the segment's parameter range [0, 1] against the rect's
+// x and y extents (optionally grown by `pad`). Exact at any segment length,
+// so fast movers can't tunnel through thin walls between samples.
+function segmentIntersectsRect(x0, y0, x1, y1, rect, pad = 0) {
+  const minX = rect.x - pad;
+  const maxX = rect.x + rect.width + pad;
+  const minY = rect.y - pad;
+  const maxY = rect.y + rect.height + pad;
+  // Cheap reject for walls nowhere near the segment before any division.
+  if (
+    (x0 < minX && x1 < minX) ||
+    (x0 > maxX && x1 > maxX) ||
+    (y0 < minY && y1 < minY) ||
+    (y0 > maxY && y1 > maxY)
+  ) {
+    return false;
+  }
+  const dx = x1 - x0;
+  const dy = y1 - y0;
+  let tEnter = 0;
+  let tExit = 1;
+
+  if (dx === 0) {
+    if (x0 < minX || x0 > maxX) return false;
+  } else {
+    let t1 = (minX - x0) / dx;
+    let t2 = (maxX - x0) / dx;
+    if (t1 > t2) {
+      const tmp = t1;
+      t1 = t2;
+      t2 = tmp;
+    }
+    if (t1 > tEnter) tEnter = t1;
+    if (t2 < tExit) tExit = t2;
+    if (tEnter > tExit) return false;
+  }
+
+  if (dy === 0) {
+    if (y0 < minY || y0 > maxY) return false;
+  } else {
+    let t1 = (minY - y0) / dy;
+    let t2 = (maxY - y0) / dy;
+    if (t1 > t2) {
+      const tmp = t1;
+      t1 = t2;
+      t2 = tmp;
+    }
+    if (t1 > tEnter) tEnter = t1;
+    if (t2 < tExit) tExit = t2;
+    if (tEnter > tExit) return false;
+  }
+
+  return true;
+}
+
+function segmentHitsAnyWall(x0, y0, x1, y1, walls, pad = 0) {
+  for (const wall of walls) {
+    if (segmentIntersectsRect(x0, y0, x1, y1, wall, pad)) return true;
+  }
+  return false;
+}
+
+// Line-of-sight check used by the server; same slab test, no padding.
+function lineIntersectsAnyWall(x0, y0, x1, y1, walls) {
+  return segmentHitsAnyWall(x0, y0, x1, y1, walls);
+}
+
+function distanceToLineSq(px, py, x0, y0, vx, vy) {
+  const denom = vx * vx + vy * vy;
+  if (denom < 1e-9) return Infinity;
+  const t = ((px - x0) * vx + (py - y0) * vy) / denom;
+  const closestX = x0 + vx * t;
+  const closestY = y0 + vy * t;
+  const dx = px - closestX;
+  const dy = py - closestY;
+  return dx * dx + dy * dy;
+}
+
+function circleCollidesAnyWall(cx, cy, radius, walls) {
+  for (const wall of walls) {
+    const closestX = Math.max(wall.x, Math.min(cx, wall.x + wall.width));
+    const closestY = Math.max(wall.y, Math.min(cy, wall.y + wall.height));
+    const dx = cx - closestX;
+    const dy = cy - closestY;
+    if (dx * dx + dy * dy < radius * radius) {
+      return true;
+    }
+  }
+  return false;
+}
+
+// Squared distance from (px, py) to the closest point on segment (x0,y0)-(x1,y1)
+function distanceToSegmentSq(px, py, x0, y0, x1, y1) {
+  const vx = x1 - x0;
+  const vy = y1 - y0;
+  const lenSq = vx * vx + vy * vy;
+  let t = 0;
+  if (lenSq > 0) {
+    t = ((px - x0) * vx + (py - y0) * vy) / lenSq;
+    t = Math.max(0, Math.min(1, t));
+  }
+  const dx = px - (x0 + vx * t);
+  const dy = py - (y0 + vy * t);
+  return dx * dx + dy * dy;
+}
+
+// Node (server) export
+if (typeof module !== "undefined" && module.exports) {
+  module.exports = {
+    lineIntersectsAnyWall,
+    segmentIntersectsRect,
+    segmentHitsAnyWall,
+    distanceToLineSq,
+    distanceToSegmentSq,
+    circleCollidesAnyWall,
+  };
+}
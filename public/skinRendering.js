@@ -55,6 +55,14 @@
 // Colors can be any valid CSS color string.
 // --------------------------------------------------------------------
 
+const TWO_PI = Math.PI * 2;
+
+// Wrap an angle difference into [-PI, PI) with a single floor instead of a
+// float modulo, so aim easing always takes the short way around.
+function wrapAngleDelta(delta) {
+  return delta - TWO_PI * Math.floor((delta + Math.PI) / TWO_PI);
+}
+
 function getDefaultSkinKeyByWeapon() {
   const map = {};
   if (typeof WEAPON_SKINS === "undefined") return map;
@@ -443,8 +451,10 @@ function startWeaponSkinMiniPreview(canvas, weaponKey, skinKey) {
     const originX = cssWidth / 2;
     const originY = cssHeight * 0.7;
 
-    const tipX = originX + Math.cos(state.angle) * barrelLength;
-    const tipY = originY + Math.sin(state.angle) * barrelLength;
+    const cos = Math.cos(state.angle);
+    const sin = Math.sin(state.angle);
+    const tipX = originX + cos * barrelLength;
+    const tipY = originY + sin * barrelLength;
 
     const color =
       typeof getBulletColorForWeaponSkin === "function"
@@ -455,6 +465,8 @@ function startWeaponSkinMiniPreview(canvas, weaponKey, skinKey) {
       x: tipX,
       y: tipY,
       angle: state.angle,
+      vx: cos * bulletSpeed * 0.5,
+      vy: sin * bulletSpeed * 0.5,
       color,
     });
   }
@@ -494,7 +506,7 @@ function startWeaponSkinMiniPreview(canvas, weaponKey, skinKey) {
 
     // Smoothly move current angle toward target.
     const lerpFactor = 0.18;
-    const delta = state.targetAngle - state.angle;
+    const delta = wrapAngleDelta(state.targetAngle - state.angle);
     state.angle += delta * lerpFactor;
 
     // Auto-fire occasionally when idle so the bullets are visible.
@@ -504,8 +516,8 @@ function startWeaponSkinMiniPreview(canvas, weaponKey, skinKey) {
 
     // Advance bullets.
     state.bullets.forEach((b) => {
-      b.x += Math.cos(b.angle) * bulletSpeed * 0.5;
-      b.y += Math.sin(b.angle) * bulletSpeed * 0.5;
+      b.x += b.vx;
+      b.y += b.vy;
     });
     state.bullets = state.bullets.filter(
       (b) =>
@@ -8,7 +8,7 @@ const {
 } = require("../lib/userStore");
 const { ALL_SKINS_BY_KEY, WEAPON_SKINS } = require("../lib/skins");
 
-function createShopRoutes({ io, activePlayers }) {
+function createShopRoutes({ activePlayers, emitGameState }) {
   const router = express.Router();
 
   router.get("/skins", (req, res) => {
@@ -149,7 +149,7 @@ function createShopRoutes({ io, activePlayers }) {
       }
     });
     if (activePlayers.length > 0) {
-      io.emit("gameState", activePlayers);
+      emitGameState();
     }
 
     saveUsers();
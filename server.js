@@ -19,7 +19,10 @@ const gameState = createGameServer(io);
 app.use("/api", createAuthRoutes());
 app.use(
   "/api/shop",
-  createShopRoutes({ io, activePlayers: gameState.activePlayers }),
+  createShopRoutes({
+    activePlayers: gameState.activePlayers,
+    emitGameState: gameState.emitGameState,
+  }),
 );
 
 server.listen(3001, () => {